@@ -1,5 +1,6 @@
 import requests
 import sys
+import msgpack
 
 # URL base de nuestra API (Servidor) a la que nos conectaremos
 BASE_URL = "http://127.0.0.1:5000"
@@ -8,6 +9,20 @@ BASE_URL = "http://127.0.0.1:5000"
 TOKEN = None 
 CURRENT_ROLE = None  # Guardará el rol del usuario ('user' o 'admin') tras hacer login
 
+# Formato compacto que ofrece el servidor para los listados (un array por campo)
+TIPO_MSGPACK = "application/x-msgpack"
+# Preferimos MessagePack y dejamos JSON como alternativa. La compresión gzip/deflate
+# ya la pide y la deshace automáticamente la librería requests.
+CABECERAS_LISTA = {"Accept": f"{TIPO_MSGPACK}, application/json;q=0.9"}
+
+def decodificar_lista(res):
+    """Devuelve una lista de diccionarios, tanto si el servidor respondió en JSON como en MessagePack columnar."""
+    if res.headers.get('Content-Type', '').startswith(TIPO_MSGPACK):
+        columnas = msgpack.unpackb(res.content)
+        # {"id": [...], "nombre": [...]} -> [{"id": ..., "nombre": ...}, ...]
+        return [dict(zip(columnas, valores)) for valores in zip(*columnas.values())]
+    return res.json()
+
 def menu():
     """Muestra todas las opciones disponibles en la interfaz."""
     rol_str = f" (Rol: {CURRENT_ROLE})" if CURRENT_ROLE else " (Sin login)"
@@ -65,12 +80,12 @@ def ver_catalogo():
     """Consulta al servidor todo el catálogo de productos disponibles."""
     try:
         # Hacemos una petición GET pública al servidor (no pedirá token)
-        res = requests.get(f"{BASE_URL}/productos")
+        res = requests.get(f"{BASE_URL}/productos", headers=CABECERAS_LISTA)
         if res.status_code == 200:
-            productos = res.json()
+            productos = decodificar_lista(res)
             print("\n--- CATÁLOGO ---")
             for p in productos:
-                print(f"ID: {p['_id']} | [{p['tipo']}] {p['nombre']} - {p['precio']}€ (Stock: {p['stock']})")
+                print(f"ID: {p['id']} | [{p['tipo']}] {p['nombre']} - {p['precio']}€ (Stock: {p['stock']})")
         else:
             print(">> Error al obtener productos")
     except Exception as e:
@@ -180,12 +195,12 @@ def ver_pedidos():
     if not TOKEN:
         print(">> ERROR: Inicia sesión primero.")
         return
-    headers = {"Authorization": f"Bearer {TOKEN}"}
+    headers = {"Authorization": f"Bearer {TOKEN}", **CABECERAS_LISTA}
     try:
         res = requests.get(f"{BASE_URL}/mis-pedidos", headers=headers)
         if res.status_code == 200:
             print("\n--- MIS PEDIDOS ---")
-            for o in res.json():
+            for o in decodificar_lista(res):
                 print(f"- {o['producto']} ({o['precio']}€) [{o['estado']}]")
         else:
             print(">> Error al recuperar pedidos.")
@@ -2,7 +2,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 from bson.objectid import ObjectId
 from jsonschema import validate, ValidationError
@@ -11,6 +11,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from config import Configuracion
 from extensiones import db, jwt, mongo
 from repositorios import FabricaRepositorios
+from negociacion import responder_lista
 
 # Inicialización de la aplicación web con Flask
 app = Flask(__name__)
@@ -95,7 +96,7 @@ def sesion():
 def ver_productos():
     """Ruta pública que devuelve la lista de todos los productos del catálogo."""
     productos = repo_productos.obtener_todos()
-    return jsonify(productos), 200
+    return responder_lista(productos, request, Response)
 
 @app.route('/productos', methods=['POST'])
 @jwt_required()  # <--- OBLIGA a que la petición incluya un token JWT válido
@@ -184,7 +185,7 @@ def pedidos():
         return jsonify({"msg": "Usuario no encontrado"}), 404
         
     orders = repo_pedidos.obtener_por_usuario(user_db['id'])
-    return jsonify(orders), 200
+    return responder_lista(orders, request, Response)
 
 @app.route('/perfil', methods=['GET'])
 @jwt_required()
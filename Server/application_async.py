@@ -0,0 +1,230 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+import jwt as pyjwt
+from quart import Quart, request, jsonify, g, Response
+from jsonschema import validate, ValidationError
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from config import Configuracion
+from repositorios_async import FabricaRepositoriosAsync
+from negociacion import responder_lista
+
+# Variante asíncrona (ASGI) de application.py. Las rutas y respuestas son las mismas,
+# pero cada petición espera a la base de datos sin bloquear un hilo, así que un solo
+# proceso atiende muchas más peticiones simultáneas.
+# Se arranca con un servidor ASGI, por ejemplo:  hypercorn application_async:app
+app = Quart(__name__)
+app.config.from_object(Configuracion)
+
+# Fábrica de repositorios asíncronos
+fabrica = FabricaRepositoriosAsync(Configuracion.MOTOR_BD)
+repo_usuarios = fabrica.obtener_repo_usuario()
+repo_productos = fabrica.obtener_repo_producto()
+repo_pedidos = fabrica.obtener_repo_pedido()
+
+# ==========================================
+# TOKENS JWT
+# ==========================================
+# flask_jwt_extended solo funciona con Flask, así que firmamos y comprobamos los tokens
+# con PyJWT usando los mismos campos. Un token emitido por application.py vale aquí y viceversa.
+
+def crear_token(identidad):
+    ahora = datetime.now(timezone.utc)
+    # Misma caducidad que flask_jwt_extended: JWT_ACCESS_TOKEN_EXPIRES o 15 minutos por defecto
+    caducidad = app.config.get("JWT_ACCESS_TOKEN_EXPIRES", timedelta(minutes=15))
+    if isinstance(caducidad, int): caducidad = timedelta(seconds=caducidad)
+    datos = {
+        "fresh": False,
+        "iat": ahora,
+        "jti": str(uuid.uuid4()),
+        "type": "access",
+        "sub": identidad,
+        "nbf": ahora,
+        "exp": ahora + caducidad,
+    }
+    return pyjwt.encode(datos, Configuracion.JWT_SECRET_KEY, algorithm="HS256")
+
+def jwt_requerido(ruta):
+    """Equivalente a @jwt_required(): deja la identidad del token en g.identidad."""
+    @wraps(ruta)
+    async def envoltura(*args, **kwargs):
+        cabecera = request.headers.get('Authorization', '')
+        if not cabecera.startswith('Bearer '):
+            return jsonify({"msg": "Missing Authorization Header"}), 401
+        try:
+            datos = pyjwt.decode(cabecera[len('Bearer '):], Configuracion.JWT_SECRET_KEY, algorithms=["HS256"],
+                                 options={"require": ["exp", "sub", "type"]})
+        except pyjwt.ExpiredSignatureError:
+            return jsonify({"msg": "Token has expired"}), 401
+        except pyjwt.InvalidTokenError as e:
+            return jsonify({"msg": f"Token no válido: {e}"}), 422
+        if datos["type"] != "access":
+            return jsonify({"msg": "Only non-refresh tokens are allowed"}), 422
+        g.identidad = datos['sub']
+        return await ruta(*args, **kwargs)
+    return envoltura
+
+# ==========================================
+# RUTAS DE AUTENTICACIÓN
+# ==========================================
+
+@app.route('/registro', methods=['POST'])
+async def registro():
+    """Ruta para dar de alta a un usuario nuevo en el sistema."""
+    try:
+        data = await request.get_json()
+
+        schema = {
+            "type": "object",
+            "properties": {
+                "nombre": { "type": "string", "minLength": 3 },
+                "contraseña": { "type": "string", "minLength": 4 },
+                "rol": { "enum": ["user", "admin"] }
+            },
+            "required": ["nombre", "contraseña", "rol"],
+            "additionalProperties": False
+        }
+        validate(instance=data, schema=schema)
+
+        if await repo_usuarios.buscar_por_nombre(data['nombre']):
+            return jsonify({"msg": "El usuario ya existe"}), 400
+
+        # El hash es costoso en CPU: lo sacamos a un hilo para no frenar el resto de peticiones
+        hashed_contraseña = await asyncio.to_thread(generate_password_hash, data['contraseña'])
+
+        await repo_usuarios.crear(data['nombre'], hashed_contraseña, data['rol'])
+
+        return jsonify({"msg": "Usuario registrado correctamente"}), 201
+    except ValidationError as e:
+        return jsonify({"msg": e.message}), 400
+    except Exception as e:
+        return jsonify({"msg": f"Error en el servidor: {e}"}), 500
+
+@app.route('/sesion', methods=['POST'])
+async def sesion():
+    """Ruta para que un usuario inicie sesión y reciba su token JWT."""
+    try:
+        data = await request.get_json()
+        user = await repo_usuarios.buscar_por_nombre(data['nombre'])
+
+        if user and await asyncio.to_thread(check_password_hash, user['contrasena_hash'], data['contraseña']):
+            access_token = crear_token(user['nombre'])
+            return jsonify({'access_token': access_token, 'rol': user['rol']}), 200
+
+        return jsonify({"msg": "Credenciales incorrectas"}), 401
+    except Exception as e:
+        return jsonify({"msg": f"Error interno: {e}"}), 500
+
+# ==========================================
+# RUTAS DE PRODUCTOS (CRUD)
+# ==========================================
+
+@app.route('/productos', methods=['GET'])
+async def ver_productos():
+    """Ruta pública que devuelve la lista de todos los productos del catálogo."""
+    productos = await repo_productos.obtener_todos()
+    return responder_lista(productos, request, Response)
+
+@app.route('/productos', methods=['POST'])
+@jwt_requerido
+async def añadir_producto():
+    """Crea un nuevo producto. Ruta exclusiva para administradores."""
+    user_db = await repo_usuarios.buscar_por_nombre(g.identidad)
+    if not user_db or user_db['rol'] != 'admin':
+        return jsonify({"msg": "Acceso denegado"}), 403
+
+    try:
+        data = await request.get_json()
+        await repo_productos.crear(data)
+        return jsonify({"msg": "Producto añadido correctamente"}), 201
+    except Exception as e:
+        return jsonify({"msg": f"Error al añadir producto: {e}"}), 400
+
+@app.route('/productos/<id>', methods=['PUT'])
+@jwt_requerido
+async def actualizar_producto(id):
+    user_db = await repo_usuarios.buscar_por_nombre(g.identidad)
+    if not user_db or user_db['rol'] != 'admin':
+        return jsonify({"msg": "Acceso denegado"}), 403
+
+    try:
+        data = await request.get_json()
+        if await repo_productos.actualizar(id, data):
+            return jsonify({"msg": "Producto actualizado"}), 200
+        return jsonify({"msg": "Producto no encontrado"}), 404
+    except Exception as e:
+        return jsonify({"msg": f"Error al actualizar: {e}"}), 400
+
+@app.route('/productos/<id>', methods=['DELETE'])
+@jwt_requerido
+async def eliminar_producto(id):
+    user_db = await repo_usuarios.buscar_por_nombre(g.identidad)
+    if not user_db or user_db['rol'] != 'admin':
+        return jsonify({"msg": "Acceso denegado"}), 403
+
+    try:
+        if await repo_productos.eliminar(id):
+            return jsonify({"msg": "Producto eliminado"}), 200
+        return jsonify({"msg": "Producto no encontrado"}), 404
+    except Exception as e:
+        return jsonify({"msg": f"Error al eliminar: {e}"}), 400
+
+# ==========================================
+# RUTAS DE COMPRA
+# ==========================================
+
+@app.route('/comprar/<id>', methods=['POST'])
+@jwt_requerido
+async def comprar_productos(id):
+    """Permite al usuario logueado comprar un producto, restando stock y guardando un ticket (pedido)."""
+    user_db = await repo_usuarios.buscar_por_nombre(g.identidad)
+
+    if not user_db:
+        return jsonify({"msg": "Usuario no válido"}), 400
+
+    producto = await repo_productos.obtener_por_id(id)
+
+    if not producto or producto.get('stock', 0) < 1:
+        return jsonify({"msg": "Producto no disponible o ID no existe"}), 400
+
+    try:
+        # La comprobación de stock de arriba puede quedarse vieja mientras esperamos a otras peticiones;
+        # crear_pedido la repite de forma atómica y devuelve False si ya no queda
+        if not await repo_pedidos.crear_pedido(user_db['id'], id, producto['nombre'], producto['precio']):
+            return jsonify({"msg": "Producto no disponible o ID no existe"}), 400
+        return jsonify({"msg": f"¡Compra exitosa de {producto['nombre']}!"}), 200
+    except Exception as e:
+        return jsonify({"msg": f"Error al realizar pedido: {e}"}), 400
+
+@app.route('/mis-pedidos', methods=['GET'])
+@jwt_requerido
+async def pedidos():
+    user_db = await repo_usuarios.buscar_por_nombre(g.identidad)
+    if not user_db:
+        return jsonify({"msg": "Usuario no encontrado"}), 404
+
+    orders = await repo_pedidos.obtener_por_usuario(user_db['id'])
+    return responder_lista(orders, request, Response)
+
+@app.route('/perfil', methods=['GET'])
+@jwt_requerido
+async def perfil():
+    user = await repo_usuarios.buscar_por_nombre(g.identidad)
+
+    if not user:
+        return jsonify({"msg": "Usuario no encontrado"}), 404
+
+    return jsonify({
+        "nombre": user['nombre'],
+        "rol": user['rol']
+    }), 200
+
+if __name__ == '__main__':
+    app.run(debug=True, port=5000)
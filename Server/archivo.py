@@ -0,0 +1,107 @@
+import gzip
+import json
+import os
+
+from config import Configuracion
+
+class ArchivoPedidos:
+    """Almacén de los pedidos antiguos, fuera de la tabla/colección 'pedidos'.
+
+    Hay un segmento por mes (AAAA-MM.seg) al que solo se le añaden datos. Cada vez que se
+    archiva, se escribe al final un bloque gzip por usuario con sus pedidos (una línea JSON
+    por pedido). El índice AAAA-MM.idx.json guarda, por usuario, la posición y el tamaño de
+    sus bloques, así que leer el historial de un usuario solo descomprime sus propios bloques.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        # Caché de índices ya leídos: ruta -> ((inodo, fecha de modificación, tamaño), índice)
+        self._indices = {}
+
+    def _rutas(self, mes):
+        return os.path.join(self.directorio, f"{mes}.seg"), os.path.join(self.directorio, f"{mes}.idx.json")
+
+    def _cargar_indice(self, ruta_idx):
+        if not os.path.exists(ruta_idx): return {}
+        with open(ruta_idx, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _indice_en_cache(self, ruta_idx):
+        try:
+            estado = os.stat(ruta_idx)
+        except FileNotFoundError:
+            return {}
+        # os.replace deja un inodo nuevo en cada escritura: con solo la fecha de modificación
+        # dos índices escritos en el mismo instante del reloj parecerían el mismo
+        version = (estado.st_ino, estado.st_mtime_ns, estado.st_size)
+        en_cache = self._indices.get(ruta_idx)
+        if en_cache and en_cache[0] == version: return en_cache[1]
+        indice = self._cargar_indice(ruta_idx)
+        self._indices[ruta_idx] = (version, indice)
+        return indice
+
+    def añadir(self, pedidos):
+        """Archiva una lista de pedidos: dicts con id, usuario_id, producto, precio, estado y fecha (datetime).
+
+        Primero se escriben los bloques y después se sustituye el índice de golpe (os.replace),
+        así quien lea a la vez nunca ve un índice que apunte a datos a medio escribir.
+        Solo debe haber un proceso archivando a la vez.
+        """
+        por_mes = {}
+        for p in pedidos:
+            por_mes.setdefault(p['fecha'].strftime('%Y-%m'), {}).setdefault(str(p['usuario_id']), []).append(p)
+
+        os.makedirs(self.directorio, exist_ok=True)
+        for mes, por_usuario in por_mes.items():
+            ruta_seg, ruta_idx = self._rutas(mes)
+            indice = self._cargar_indice(ruta_idx)
+            with open(ruta_seg, 'ab') as f:
+                for usuario_id, lista in por_usuario.items():
+                    lineas = ''.join(json.dumps({
+                        "id": str(p['id']),
+                        "producto": p['producto'],
+                        "precio": p['precio'],
+                        "estado": p['estado'],
+                        "fecha": p['fecha'].isoformat()
+                    }) + '\n' for p in lista)
+                    bloque = gzip.compress(lineas.encode('utf-8'))
+                    indice.setdefault(usuario_id, []).append([f.tell(), len(bloque)])
+                    f.write(bloque)
+                f.flush()
+                os.fsync(f.fileno())
+
+            temporal = ruta_idx + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                json.dump(indice, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, ruta_idx)
+
+    def leer_usuario(self, usuario_id, excluir=()):
+        """Devuelve los pedidos archivados de un usuario, del mes más antiguo al más reciente.
+
+        `excluir` son claves (id, fecha en ISO) de pedidos que siguen en la tabla caliente: si el
+        archivado se interrumpió antes de borrarlos, pueden estar en los dos sitios y no queremos
+        repetirlos. El id solo no basta porque SQLite reutiliza los ids de las filas borradas.
+        """
+        usuario_id = str(usuario_id)
+        vistos = set(excluir)
+        pedidos = []
+        if not os.path.isdir(self.directorio): return pedidos
+        for nombre in sorted(os.listdir(self.directorio)):
+            if not nombre.endswith('.idx.json'): continue
+            ruta_seg, ruta_idx = self._rutas(nombre[:-len('.idx.json')])
+            bloques = self._indice_en_cache(ruta_idx).get(usuario_id)
+            if not bloques: continue
+            with open(ruta_seg, 'rb') as f:
+                for inicio, longitud in bloques:
+                    f.seek(inicio)
+                    for linea in gzip.decompress(f.read(longitud)).decode('utf-8').splitlines():
+                        p = json.loads(linea)
+                        clave = (p['id'], p['fecha'])
+                        if clave in vistos: continue
+                        vistos.add(clave)
+                        pedidos.append(p)
+        return pedidos
+
+archivo_pedidos = ArchivoPedidos(Configuracion.ARCHIVO_PEDIDOS_DIR)
@@ -1,11 +1,20 @@
 import os
 
+DIRECTORIO_BASE = os.path.dirname(os.path.abspath(__file__))
+
 class Configuracion:
     MOTOR_BD = 'SQL'
     # SQL
     SQLALCHEMY_DATABASE_URI = 'sqlite:///fothelcards.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQL asíncrono (mismo fichero SQLite que usa Flask, accedido con aiosqlite)
+    SQLALCHEMY_DATABASE_URI_ASYNC = 'sqlite+aiosqlite:///' + os.path.join(DIRECTORIO_BASE, 'instance', 'fothelcards.db')
     # MongoDB
     MONGO_URI = "mongodb://localhost:27017/fothelcards"
+    # Archivo de pedidos antiguos (lo rellena archivar_pedidos.py)
+    ARCHIVO_PEDIDOS_DIAS = 180
+    ARCHIVO_PEDIDOS_DIR = os.path.join(DIRECTORIO_BASE, 'instance', 'archivo_pedidos')
+    # Los listados por debajo de este tamaño se envían sin comprimir (no compensa)
+    COMPRESION_UMBRAL_BYTES = 1024
     # Clave secreta para firmar los tokens
     JWT_SECRET_KEY = "super-secreto-coleccionable"
\ No newline at end of file
@@ -0,0 +1,11 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config import Configuracion
+
+# Herramientas asíncronas equivalentes a las de extensiones.py (usadas por application_async.py)
+engine_sql = create_async_engine(Configuracion.SQLALCHEMY_DATABASE_URI_ASYNC)
+SesionAsync = async_sessionmaker(engine_sql, expire_on_commit=False)
+
+# El cliente de motor no abre conexiones hasta la primera consulta
+mongo_async = AsyncIOMotorClient(Configuracion.MONGO_URI).get_default_database()
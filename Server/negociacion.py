@@ -0,0 +1,76 @@
+import gzip
+import json
+import zlib
+
+import msgpack
+
+from config import Configuracion
+
+# Negociación de contenido para las rutas que devuelven listados (/productos, /mis-pedidos).
+# La usan tanto application.py como application_async.py; cada una pasa su propia clase
+# Response (Flask o Quart) a responder_lista.
+
+TIPO_JSON = 'application/json'
+TIPO_MSGPACK = 'application/x-msgpack'
+
+def _calidades(cabecera):
+    """Convierte una cabecera Accept/Accept-Encoding en {valor: q}."""
+    calidades = {}
+    for parte in (cabecera or '').split(','):
+        valor, _, parametros = parte.partition(';')
+        valor = valor.strip().lower()
+        if not valor: continue
+        q = 1.0
+        for parametro in parametros.split(';'):
+            clave, _, numero = parametro.strip().partition('=')
+            if clave == 'q':
+                try: q = float(numero)
+                except ValueError: q = 0.0
+        calidades[valor] = q
+    return calidades
+
+def a_columnas(filas):
+    """Pasa una lista de diccionarios a un diccionario con un array por campo.
+
+    [{"id": "1", "nombre": "A"}, {"id": "2", "nombre": "B"}] -> {"id": ["1", "2"], "nombre": ["A", "B"]}
+    Así cada clave viaja una sola vez en lugar de repetirse en cada fila.
+    """
+    if not filas: return {}
+    return {campo: [fila.get(campo) for fila in filas] for campo in filas[0]}
+
+def negociar_lista(filas, accept, accept_encoding, umbral):
+    """Devuelve (cuerpo, tipo, cabeceras) para un listado según lo que acepte el cliente.
+
+    - Si el cliente prefiere MessagePack se envía en formato columnar; si no, JSON normal.
+    - Si el cuerpo ocupa al menos `umbral` bytes y el cliente lo admite, se comprime con gzip o deflate.
+    """
+    tipos = _calidades(accept)
+    q_msgpack = tipos.get(TIPO_MSGPACK, 0.0)
+    q_json = tipos.get(TIPO_JSON, tipos.get('*/*', 1.0 if not tipos else 0.0))
+    if q_msgpack > 0 and q_msgpack >= q_json:
+        tipo = TIPO_MSGPACK
+        cuerpo = msgpack.packb(a_columnas(filas))
+    else:
+        tipo = TIPO_JSON
+        cuerpo = json.dumps(filas, separators=(',', ':')).encode('utf-8')
+
+    cabeceras = {'Vary': 'Accept, Accept-Encoding'}
+    if len(cuerpo) >= umbral:
+        codificaciones = _calidades(accept_encoding)
+        q_gzip = codificaciones.get('gzip', 0.0)
+        q_deflate = codificaciones.get('deflate', 0.0)
+        if q_gzip > 0 and q_gzip >= q_deflate:
+            cuerpo = gzip.compress(cuerpo)
+            cabeceras['Content-Encoding'] = 'gzip'
+        elif q_deflate > 0:
+            # En HTTP "deflate" significa el formato zlib, que es lo que genera zlib.compress
+            cuerpo = zlib.compress(cuerpo)
+            cabeceras['Content-Encoding'] = 'deflate'
+    return cuerpo, tipo, cabeceras
+
+def responder_lista(filas, peticion, clase_respuesta):
+    """Construye la respuesta de un listado a partir de la petición actual (Flask o Quart)."""
+    cuerpo, tipo, cabeceras = negociar_lista(filas, peticion.headers.get('Accept'),
+                                             peticion.headers.get('Accept-Encoding'),
+                                             Configuracion.COMPRESION_UMBRAL_BYTES)
+    return clase_respuesta(cuerpo, status=200, mimetype=tipo, headers=cabeceras)
@@ -1,4 +1,5 @@
 from extensiones import db, mongo
+from archivo import archivo_pedidos
 from Modelos import Usuario, Producto, Pedido, Rol, Opinion
 from bson.objectid import ObjectId
 
@@ -63,7 +64,26 @@ class RepositorioPedidoSQL:
     
     def obtener_por_usuario(self, usuario_id):
         pedidos = Pedido.query.filter_by(usuario_id=int(usuario_id)).all()
-        return [{"producto": p.nombre_producto, "precio": p.precio, "estado": p.estado} for p in pedidos]
+        # Primero los archivados (son los más antiguos) y después los de la tabla
+        archivados = archivo_pedidos.leer_usuario(usuario_id, excluir={(str(p.id), p.fecha.isoformat()) for p in pedidos if p.fecha})
+        return [{"producto": p['producto'], "precio": p['precio'], "estado": p['estado']} for p in archivados] + \
+               [{"producto": p.nombre_producto, "precio": p.precio, "estado": p.estado} for p in pedidos]
+
+    def archivar_anteriores_a(self, limite, lote=5000):
+        """Mueve al archivo los pedidos con fecha anterior a `limite` y los borra de la tabla. Devuelve cuántos."""
+        total = 0
+        ultimo_id = 0
+        while True:
+            # Avanzamos por la clave primaria para no volver a recorrer la tabla desde el principio en cada lote
+            antiguos = Pedido.query.filter(Pedido.id > ultimo_id, Pedido.fecha < limite).order_by(Pedido.id).limit(lote).all()
+            if not antiguos: return total
+            archivo_pedidos.añadir([{"id": p.id, "usuario_id": p.usuario_id, "producto": p.nombre_producto,
+                                     "precio": p.precio, "estado": p.estado, "fecha": p.fecha} for p in antiguos])
+            # Solo se borran una vez escritos en el archivo, con un único DELETE por lote
+            ultimo_id = antiguos[-1].id
+            Pedido.query.filter(Pedido.id.in_([p.id for p in antiguos])).delete(synchronize_session=False)
+            db.session.commit()
+            total += len(antiguos)
 
 # ==========================================
 # REPOSITORIOS MONGODB
@@ -112,8 +132,23 @@ class RepositorioPedidoMongo:
         return True
     
     def obtener_por_usuario(self, usuario_id):
-        pedidos = mongo.db.pedidos.find({"usuario_id": str(usuario_id)})
-        return [{"producto": p['nombre_producto'], "precio": p['precio'], "estado": p['estado']} for p in pedidos]
+        pedidos = list(mongo.db.pedidos.find({"usuario_id": str(usuario_id)}))
+        archivados = archivo_pedidos.leer_usuario(usuario_id, excluir={(str(p['_id']), p['_id'].generation_time.isoformat()) for p in pedidos})
+        return [{"producto": p['producto'], "precio": p['precio'], "estado": p['estado']} for p in archivados] + \
+               [{"producto": p['nombre_producto'], "precio": p['precio'], "estado": p['estado']} for p in pedidos]
+
+    def archivar_anteriores_a(self, limite, lote=5000):
+        """Mueve al archivo los pedidos anteriores a `limite` y los borra de la colección. Devuelve cuántos."""
+        # Los pedidos de Mongo no guardan fecha: usamos la de creación que lleva el propio ObjectId
+        filtro = {"_id": {"$lt": ObjectId.from_datetime(limite)}}
+        total = 0
+        while True:
+            antiguos = list(mongo.db.pedidos.find(filtro).sort("_id", 1).limit(lote))
+            if not antiguos: return total
+            archivo_pedidos.añadir([{"id": p['_id'], "usuario_id": p['usuario_id'], "producto": p['nombre_producto'],
+                                     "precio": p['precio'], "estado": p['estado'], "fecha": p['_id'].generation_time} for p in antiguos])
+            mongo.db.pedidos.delete_many({"_id": {"$in": [p['_id'] for p in antiguos]}})
+            total += len(antiguos)
 
 # ==========================================
 # FÁBRICA DE REPOSITORIOS
@@ -0,0 +1,174 @@
+import asyncio
+
+from sqlalchemy import select, update
+from bson.objectid import ObjectId
+
+from extensiones_async import SesionAsync, mongo_async
+from archivo import archivo_pedidos
+from Modelos import Usuario, Producto, Pedido, Rol
+
+# Versiones asíncronas de los repositorios de repositorios.py.
+# Devuelven los mismos diccionarios, pero cada método es una corrutina.
+
+# ==========================================
+# REPOSITORIOS SQL (SQLAlchemy async + aiosqlite)
+# ==========================================
+class RepositorioUsuarioSQLAsync:
+    async def buscar_por_nombre(self, nombre):
+        async with SesionAsync() as sesion:
+            fila = (await sesion.execute(
+                select(Usuario, Rol.nombre).join(Rol, Usuario.rol_id == Rol.id).filter(Usuario.nombre == nombre)
+            )).first()
+        if fila:
+            u, nombre_rol = fila
+            return {"id": str(u.id), "nombre": u.nombre, "contrasena_hash": u.contrasena_hash, "rol": nombre_rol}
+        return None
+
+    async def crear(self, nombre, contrasena_hash, nombre_rol):
+        async with SesionAsync() as sesion:
+            rol_id = await sesion.scalar(select(Rol.id).filter_by(nombre=nombre_rol))
+            if not rol_id: rol_id = await sesion.scalar(select(Rol.id).filter_by(nombre='user'))
+            sesion.add(Usuario(nombre=nombre, contrasena_hash=contrasena_hash, rol_id=rol_id))
+            await sesion.commit()
+        return True
+
+class RepositorioProductoSQLAsync:
+    async def obtener_todos(self):
+        async with SesionAsync() as sesion:
+            productos = (await sesion.scalars(select(Producto))).all()
+        return [{"id": str(p.id), "nombre": p.nombre, "tipo": p.tipo, "precio": p.precio, "stock": p.stock} for p in productos]
+
+    async def obtener_por_id(self, id_producto):
+        async with SesionAsync() as sesion:
+            p = await sesion.get(Producto, int(id_producto))
+        if p: return {"id": str(p.id), "nombre": p.nombre, "tipo": p.tipo, "precio": p.precio, "stock": p.stock}
+        return None
+
+    async def crear(self, datos):
+        async with SesionAsync() as sesion:
+            sesion.add(Producto(nombre=datos['nombre'], tipo=datos['tipo'], precio=datos['precio'], stock=datos['stock']))
+            await sesion.commit()
+        return True
+
+    async def actualizar(self, id_producto, datos):
+        async with SesionAsync() as sesion:
+            producto = await sesion.get(Producto, int(id_producto))
+            if not producto: return False
+            if 'nombre' in datos: producto.nombre = datos['nombre']
+            if 'tipo' in datos: producto.tipo = datos['tipo']
+            if 'precio' in datos: producto.precio = float(datos['precio'])
+            if 'stock' in datos: producto.stock = int(datos['stock'])
+            await sesion.commit()
+        return True
+
+    async def eliminar(self, id_producto):
+        async with SesionAsync() as sesion:
+            producto = await sesion.get(Producto, int(id_producto))
+            if producto:
+                await sesion.delete(producto)
+                await sesion.commit()
+                return True
+        return False
+
+class RepositorioPedidoSQLAsync:
+    async def crear_pedido(self, usuario_id, id_producto, nombre_producto, precio):
+        async with SesionAsync() as sesion:
+            # Restamos el stock en la propia base de datos y solo si queda: dos compras simultáneas
+            # no pueden leer el mismo valor y dejar el producto en negativo
+            resultado = await sesion.execute(
+                update(Producto).where(Producto.id == int(id_producto), Producto.stock > 0).values(stock=Producto.stock - 1)
+            )
+            if resultado.rowcount == 0:
+                await sesion.rollback()
+                return False
+            sesion.add(Pedido(usuario_id=int(usuario_id), nombre_producto=nombre_producto, precio=precio, estado="Completado"))
+            await sesion.commit()
+        return True
+
+    async def obtener_por_usuario(self, usuario_id):
+        async with SesionAsync() as sesion:
+            pedidos = (await sesion.scalars(select(Pedido).filter_by(usuario_id=int(usuario_id)))).all()
+        # El archivo se lee de disco: lo hacemos en un hilo para no bloquear el bucle de eventos
+        archivados = await asyncio.to_thread(archivo_pedidos.leer_usuario, usuario_id,
+                                               {(str(p.id), p.fecha.isoformat()) for p in pedidos if p.fecha})
+        return [{"producto": p['producto'], "precio": p['precio'], "estado": p['estado']} for p in archivados] + \
+               [{"producto": p.nombre_producto, "precio": p.precio, "estado": p.estado} for p in pedidos]
+
+# ==========================================
+# REPOSITORIOS MONGODB (motor)
+# ==========================================
+class RepositorioUsuarioMongoAsync:
+    async def buscar_por_nombre(self, nombre):
+        u = await mongo_async.usuarios.find_one({"nombre": nombre})
+        if u: return {"id": str(u['_id']), "nombre": u['nombre'], "contrasena_hash": u['contrasena_hash'], "rol": u['rol']}
+        return None
+
+    async def crear(self, nombre, contrasena_hash, nombre_rol):
+        if nombre_rol not in ['admin', 'user']: nombre_rol = 'user'
+        await mongo_async.usuarios.insert_one({"nombre": nombre, "contrasena_hash": contrasena_hash, "rol": nombre_rol})
+        return True
+
+class RepositorioProductoMongoAsync:
+    async def obtener_todos(self):
+        return [{"id": str(p['_id']), "nombre": p['nombre'], "tipo": p['tipo'], "precio": p['precio'], "stock": p['stock']} async for p in mongo_async.productos.find()]
+
+    async def obtener_por_id(self, id_producto):
+        p = await mongo_async.productos.find_one({"_id": ObjectId(id_producto)})
+        if p: return {"id": str(p['_id']), "nombre": p['nombre'], "tipo": p['tipo'], "precio": p['precio'], "stock": p['stock']}
+        return None
+
+    async def crear(self, datos):
+        await mongo_async.productos.insert_one(datos)
+        return True
+
+    async def actualizar(self, id_producto, datos):
+        resultado = await mongo_async.productos.update_one({"_id": ObjectId(id_producto)}, {"$set": datos})
+        return resultado.matched_count > 0
+
+    async def eliminar(self, id_producto):
+        resultado = await mongo_async.productos.delete_one({"_id": ObjectId(id_producto)})
+        return resultado.deleted_count > 0
+
+class RepositorioPedidoMongoAsync:
+    async def crear_pedido(self, usuario_id, id_producto, nombre_producto, precio):
+        # Igual que en SQL: primero se reserva la unidad (solo si queda stock) y después se guarda el pedido
+        resultado = await mongo_async.productos.update_one({"_id": ObjectId(id_producto), "stock": {"$gt": 0}}, {"$inc": {"stock": -1}})
+        if resultado.modified_count == 0: return False
+        try:
+            await mongo_async.pedidos.insert_one({
+                "usuario_id": str(usuario_id),
+                "nombre_producto": nombre_producto,
+                "precio": precio,
+                "estado": "Completado"
+            })
+        except Exception:
+            # Sin transacción: si no se pudo guardar el pedido devolvemos la unidad reservada
+            await mongo_async.productos.update_one({"_id": ObjectId(id_producto)}, {"$inc": {"stock": 1}})
+            raise
+        return True
+
+    async def obtener_por_usuario(self, usuario_id):
+        pedidos = [p async for p in mongo_async.pedidos.find({"usuario_id": str(usuario_id)})]
+        archivados = await asyncio.to_thread(archivo_pedidos.leer_usuario, usuario_id,
+                                               {(str(p['_id']), p['_id'].generation_time.isoformat()) for p in pedidos})
+        return [{"producto": p['producto'], "precio": p['precio'], "estado": p['estado']} for p in archivados] + \
+               [{"producto": p['nombre_producto'], "precio": p['precio'], "estado": p['estado']} for p in pedidos]
+
+# ==========================================
+# FÁBRICA DE REPOSITORIOS ASÍNCRONOS
+# ==========================================
+class FabricaRepositoriosAsync:
+    def __init__(self, motor_bd):
+        self.motor_bd = motor_bd
+
+    def obtener_repo_usuario(self):
+        if self.motor_bd == 'SQL': return RepositorioUsuarioSQLAsync()
+        elif self.motor_bd == 'MONGO': return RepositorioUsuarioMongoAsync()
+
+    def obtener_repo_producto(self):
+        if self.motor_bd == 'SQL': return RepositorioProductoSQLAsync()
+        elif self.motor_bd == 'MONGO': return RepositorioProductoMongoAsync()
+
+    def obtener_repo_pedido(self):
+        if self.motor_bd == 'SQL': return RepositorioPedidoSQLAsync()
+        elif self.motor_bd == 'MONGO': return RepositorioPedidoMongoAsync()
@@ -0,0 +1,5 @@
+import sys
+import os
+
+# Los módulos del servidor se importan entre sí por nombre (config, extensiones...), igual que en application.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,50 @@
+import os
+from datetime import datetime
+
+from archivo import ArchivoPedidos
+
+def pedido(id, usuario_id, producto, fecha):
+    return {"id": id, "usuario_id": usuario_id, "producto": producto, "precio": 2.0, "estado": "Completado", "fecha": fecha}
+
+def test_añadir_y_leer_por_usuario(tmp_path):
+    archivo = ArchivoPedidos(str(tmp_path))
+    archivo.añadir([
+        pedido(1, 7, "A", datetime(2025, 1, 10)),
+        pedido(2, 8, "B", datetime(2025, 1, 11)),
+        pedido(3, 7, "C", datetime(2025, 2, 3)),
+    ])
+
+    assert sorted(os.listdir(tmp_path)) == ['2025-01.idx.json', '2025-01.seg', '2025-02.idx.json', '2025-02.seg']
+    assert [p['producto'] for p in archivo.leer_usuario(7)] == ["A", "C"]
+    assert [p['producto'] for p in archivo.leer_usuario("8")] == ["B"]
+    assert archivo.leer_usuario(9) == []
+
+def test_archivar_dos_veces_no_duplica(tmp_path):
+    # Un archivado interrumpido antes de borrar la tabla vuelve a archivar los mismos pedidos
+    archivo = ArchivoPedidos(str(tmp_path))
+    lote = [pedido(1, 7, "A", datetime(2025, 1, 10)), pedido(2, 7, "B", datetime(2025, 1, 12))]
+    archivo.añadir(lote)
+    archivo.añadir(lote)
+
+    assert [p['producto'] for p in archivo.leer_usuario(7)] == ["A", "B"]
+    # Y si siguen en la tabla caliente, tampoco se devuelven desde el archivo
+    excluir = {("1", datetime(2025, 1, 10).isoformat())}
+    assert [p['producto'] for p in archivo.leer_usuario(7, excluir=excluir)] == ["B"]
+
+def test_id_reutilizado(tmp_path):
+    # SQLite reutiliza los ids de las filas borradas: mismo id, pedidos distintos
+    archivo = ArchivoPedidos(str(tmp_path))
+    archivo.añadir([pedido(1, 7, "Antiguo", datetime(2025, 1, 10, 9, 30))])
+    archivo.añadir([pedido(1, 7, "Nuevo", datetime(2025, 6, 2, 18, 0))])
+
+    assert [p['producto'] for p in archivo.leer_usuario(7)] == ["Antiguo", "Nuevo"]
+    # Un pedido en la tabla caliente con ese mismo id no oculta los archivados
+    excluir = {("1", datetime(2026, 1, 1).isoformat())}
+    assert [p['producto'] for p in archivo.leer_usuario(7, excluir=excluir)] == ["Antiguo", "Nuevo"]
+
+def test_el_lector_ve_los_indices_reescritos(tmp_path):
+    archivo = ArchivoPedidos(str(tmp_path))
+    archivo.añadir([pedido(1, 7, "A", datetime(2025, 1, 10))])
+    assert len(archivo.leer_usuario(7)) == 1
+    archivo.añadir([pedido(2, 7, "B", datetime(2025, 1, 20))])
+    assert [p['producto'] for p in archivo.leer_usuario(7)] == ["A", "B"]
@@ -0,0 +1,50 @@
+import gzip
+import json
+import zlib
+
+import msgpack
+
+from negociacion import a_columnas, negociar_lista, TIPO_JSON, TIPO_MSGPACK
+
+PRODUCTOS = [{"id": str(i), "nombre": f"Carta {i}", "tipo": "Carta", "precio": 1.5, "stock": i} for i in range(200)]
+
+def test_a_columnas():
+    assert a_columnas(PRODUCTOS[:2]) == {
+        "id": ["0", "1"], "nombre": ["Carta 0", "Carta 1"], "tipo": ["Carta", "Carta"],
+        "precio": [1.5, 1.5], "stock": [0, 1]
+    }
+    assert a_columnas([]) == {}
+
+def test_sin_accept_devuelve_json():
+    cuerpo, tipo, cabeceras = negociar_lista(PRODUCTOS, None, None, 1024)
+    assert tipo == TIPO_JSON
+    assert json.loads(cuerpo) == PRODUCTOS
+    assert 'Content-Encoding' not in cabeceras
+
+def test_msgpack_preferido_por_q():
+    cuerpo, tipo, _ = negociar_lista(PRODUCTOS, f"{TIPO_MSGPACK}, application/json;q=0.9", None, 1024)
+    assert tipo == TIPO_MSGPACK
+    assert msgpack.unpackb(cuerpo) == a_columnas(PRODUCTOS)
+
+def test_json_preferido_por_q():
+    _, tipo, _ = negociar_lista(PRODUCTOS, f"{TIPO_MSGPACK};q=0.5, application/json", None, 1024)
+    assert tipo == TIPO_JSON
+    _, tipo, _ = negociar_lista(PRODUCTOS, f"{TIPO_MSGPACK};q=0, */*", None, 1024)
+    assert tipo == TIPO_JSON
+
+def test_comprime_segun_accept_encoding():
+    cuerpo, _, cabeceras = negociar_lista(PRODUCTOS, None, "gzip, deflate", 1024)
+    assert cabeceras['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(cuerpo)) == PRODUCTOS
+
+    cuerpo, _, cabeceras = negociar_lista(PRODUCTOS, None, "gzip;q=0.5, deflate", 1024)
+    assert cabeceras['Content-Encoding'] == 'deflate'
+    assert json.loads(zlib.decompress(cuerpo)) == PRODUCTOS
+
+    _, _, cabeceras = negociar_lista(PRODUCTOS, None, "gzip;q=0", 1024)
+    assert 'Content-Encoding' not in cabeceras
+
+def test_no_comprime_por_debajo_del_umbral():
+    cuerpo, _, cabeceras = negociar_lista(PRODUCTOS[:1], None, "gzip, deflate", 1024)
+    assert 'Content-Encoding' not in cabeceras
+    assert json.loads(cuerpo) == PRODUCTOS[:1]
@@ -0,0 +1,27 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Server'))
+
+from datetime import datetime, timedelta
+
+from application import app, repo_pedidos
+from config import Configuracion
+from extensiones import db
+
+def archivar_pedidos(dias):
+    # Todo pedido anterior a esta fecha sale de la tabla/colección y pasa al archivo comprimido
+    limite = datetime.utcnow() - timedelta(days=dias)
+    with app.app_context():
+        movidos = repo_pedidos.archivar_anteriores_a(limite)
+        print(f"{movidos} pedidos anteriores a {limite:%Y-%m-%d} movidos a {Configuracion.ARCHIVO_PEDIDOS_DIR}")
+
+        # SQLite no devuelve al disco el espacio de las filas borradas hasta hacer VACUUM
+        if movidos and Configuracion.MOTOR_BD == 'SQL':
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexion:
+                conexion.exec_driver_sql("VACUUM")
+            print("Base de datos SQL compactada.")
+
+if __name__ == '__main__':
+    # Uso: python archivar_pedidos.py [días]  (por defecto Configuracion.ARCHIVO_PEDIDOS_DIAS)
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else Configuracion.ARCHIVO_PEDIDOS_DIAS
+    archivar_pedidos(dias)